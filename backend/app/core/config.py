@@ -19,6 +19,7 @@ class Settings(BaseSettings):
     # AWS Configuration
     AWS_ACCESS_KEY_ID: str
     AWS_SECRET_ACCESS_KEY: str
+    AWS_SESSION_TOKEN: Optional[str] = None  # Set for temporary (STS/role) credentials
     AWS_REGION: str = "us-east-1"
     S3_BUCKET: str = "accountability-platform-data"
 
@@ -58,6 +59,7 @@ class Settings(BaseSettings):
     MAX_CONCURRENT_SCRAPES: int = 10
     REQUEST_TIMEOUT: int = 30
     RETRY_ATTEMPTS: int = 3
+    S3_SIGNED_HTTP: bool = False  # Signed httpx requests for single-key S3 ops
 
     class Config:
         env_file = ".env"
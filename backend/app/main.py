@@ -13,6 +13,8 @@ from app.core.middleware import (
     setup_cors,
 )
 from app.api import auth, officials, admin
+from app.services.isr_service import isr_service
+from app.services.s3_client import s3_client
 
 # Configure logging
 configure_logging()
@@ -35,6 +37,8 @@ async def lifespan(app: FastAPI):
     yield
 
     # Shutdown
+    await isr_service.close()
+    await s3_client.close()
     logger.info("app_shutdown")
 
 
@@ -0,0 +1,25 @@
+"""
+Pydantic models for per-official change-detection metadata.
+"""
+
+from pydantic import BaseModel, ConfigDict, field_validator
+from typing import Optional
+from datetime import datetime, timezone
+
+
+class MetadataRecord(BaseModel):
+    """Metadata stored at metadata/{official_id}.json."""
+    model_config = ConfigDict(extra="allow")  # Per-source data hashes vary
+
+    lastUpdated: Optional[datetime] = None
+    hash: Optional[str] = None
+
+    @field_validator("lastUpdated")
+    @classmethod
+    def normalize_to_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        """Treat naive timestamps (older records) as UTC so all records compare."""
+        if value is None:
+            return None
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
@@ -16,6 +16,10 @@ logger = get_logger(__name__)
 class CampaignWebsiteScraper(BaseScraper):
     """Scraper for campaign websites."""
 
+    async def scrape(self, url: str) -> Dict[str, Any]:
+        """Scrape campaign promises from an issues/positions page."""
+        return {"url": url, "promises": await self.scrape_issues_page(url)}
+
     async def scrape_issues_page(self, url: str) -> List[str]:
         """
         Scrape campaign promises from an issues/positions page.
@@ -21,6 +21,10 @@ class FECScraper(BaseScraper):
         super().__init__()
         self.api_key = settings.FEC_API_KEY
 
+    async def scrape(self, candidate_id: str) -> Dict[str, Any]:
+        """Scrape basic candidate information from FEC."""
+        return await self.scrape_candidate_info(candidate_id)
+
     async def scrape_financial_disclosures(self, candidate_id: str, year: int = 2024) -> List[Dict[str, Any]]:
         """
         Scrape financial disclosures including stock trades.
@@ -22,6 +22,10 @@ class OpenSecretsScraper(BaseScraper):
         super().__init__()
         self.api_key = settings.OPENSECRETS_API_KEY
 
+    async def scrape(self, cid: str, cycle: str = "2024") -> Dict[str, Any]:
+        """Scrape all campaign finance data for a candidate."""
+        return await self.scrape_all_finance_data(cid, cycle)
+
     async def scrape_candidate_summary(self, cid: str, cycle: str = "2024") -> Dict[str, Any]:
         """
         Scrape campaign finance summary for a candidate.
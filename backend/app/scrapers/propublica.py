@@ -24,6 +24,10 @@ class ProPublicaScraper(BaseScraper):
         self.api_key = settings.PROPUBLICA_API_KEY
         self.headers = {"X-API-Key": self.api_key}
 
+    async def scrape(self, member_id: str) -> Dict[str, Any]:
+        """Scrape basic information about a congress member."""
+        return await self.scrape_member(member_id)
+
     async def scrape_member(self, member_id: str) -> Dict[str, Any]:
         """
         Scrape basic information about a congress member.
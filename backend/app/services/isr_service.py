@@ -2,7 +2,7 @@
 ISR revalidation service for triggering Next.js cache invalidation.
 """
 
-from typing import List, Dict
+from typing import List, Dict, Optional
 import httpx
 
 from app.core.config import settings
@@ -17,6 +17,22 @@ class ISRService:
     def __init__(self):
         self.revalidate_url = f"{settings.VERCEL_DEPLOYMENT_URL}/api/revalidate"
         self.secret = settings.REVALIDATE_SECRET
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=10.0,
+                limits=httpx.Limits(max_keepalive_connections=16, max_connections=32),
+            )
+        return self._client
+
+    async def close(self):
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def revalidate_paths(self, paths: List[str]) -> Dict[str, bool]:
         """
@@ -30,30 +46,30 @@ class ISRService:
         """
         results = {}
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            for path in paths:
-                try:
-                    response = await client.post(
-                        self.revalidate_url,
-                        json={"path": path},
-                        headers={"Authorization": f"Bearer {self.secret}"},
+        client = self._get_client()
+        for path in paths:
+            try:
+                response = await client.post(
+                    self.revalidate_url,
+                    json={"path": path},
+                    headers={"Authorization": f"Bearer {self.secret}"},
+                )
+
+                success = response.status_code == 200
+                results[path] = success
+
+                if success:
+                    logger.info("isr_revalidate_success", path=path)
+                else:
+                    logger.warning(
+                        "isr_revalidate_failed",
+                        path=path,
+                        status=response.status_code,
                     )
 
-                    success = response.status_code == 200
-                    results[path] = success
-
-                    if success:
-                        logger.info("isr_revalidate_success", path=path)
-                    else:
-                        logger.warning(
-                            "isr_revalidate_failed",
-                            path=path,
-                            status=response.status_code,
-                        )
-
-                except Exception as e:
-                    logger.error("isr_revalidate_error", path=path, error=str(e))
-                    results[path] = False
+            except Exception as e:
+                logger.error("isr_revalidate_error", path=path, error=str(e))
+                results[path] = False
 
         return results
 
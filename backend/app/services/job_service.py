@@ -3,12 +3,13 @@ Job management service for background tasks and scraping operations.
 """
 
 import asyncio
+from collections import Counter
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 import uuid
 
 from app.core.logging import get_logger
-from app.core.exceptions import ScrapingError, AIError
+from app.core.exceptions import ScrapingError, AIError, S3Error
 from app.models.jobs import Job, JobProgress, JobError, JobResult
 from app.services.s3_client import s3_client
 from app.services.isr_service import isr_service
@@ -57,10 +58,7 @@ class JobService:
 
     async def get_job(self, job_id: str) -> Optional[Job]:
         """Get job by ID."""
-        data = await s3_client.get_json(f"jobs/{job_id}.json")
-        if data:
-            return Job(**data)
-        return None
+        return await s3_client.get_typed(f"jobs/{job_id}.json", Job)
 
     async def update_job(self, job: Job) -> bool:
         """Update job in S3."""
@@ -83,9 +81,9 @@ class JobService:
         keys.sort(reverse=True)
 
         for key in keys[:limit]:
-            data = await s3_client.get_json(key)
-            if data:
-                jobs.append(Job(**data))
+            job = await s3_client.get_typed(key, Job)
+            if job:
+                jobs.append(job)
 
         return jobs
 
@@ -111,17 +109,36 @@ class JobService:
         # donations = await self.opensecrets.scrape_all_finance_data(opensecrets_cid, "2024")
 
         # Calculate participation rate
+        vote_counts = Counter(v["vote"] for v in votes)
         total_votes = len(votes)
-        votes_cast = len([v for v in votes if v["vote"] not in ["not-voting"]])
+        votes_cast = total_votes - vote_counts["not-voting"]
         participation_rate = (votes_cast / total_votes * 100) if total_votes > 0 else 0
 
-        # Generate AI summary for votes
-        if votes:
+        # Generate AI summary for votes, reusing the stored one if votes are unchanged
+        year = datetime.utcnow().year
+        votes_key = f"votes/{official_id}/{year}.json"
+        votes_hash = s3_client.compute_hash(votes)
+        vote_summary = None
+
+        try:
+            # The hash lives in object metadata, so a HEAD decides reuse
+            head = await s3_client.head(votes_key)
+            if head and head.get("Metadata", {}).get("votes-sha256") == votes_hash:
+                previous_votes = await s3_client.get_json_fields(
+                    votes_key,
+                    ["aiSummary"],
+                    compressed=head.get("ContentEncoding") == "gzip",
+                )
+                vote_summary = (previous_votes or {}).get("aiSummary")
+        except S3Error as e:
+            logger.warning("vote_summary_lookup_failed", official_id=official_id, error=str(e))
+
+        if vote_summary is not None:
+            logger.debug("vote_summary_reused", official_id=official_id)
+        elif votes:
             vote_summary = await ai_service.summarize_voting_record(
                 votes, member_data["name"], participation_rate
             )
-        else:
-            vote_summary = None
 
         # Compile official data
         official_data = {
@@ -166,17 +183,14 @@ class JobService:
         # Save votes separately
         votes_data = {
             "officialId": official_id,
-            "year": datetime.utcnow().year,
+            "year": year,
             "lastUpdated": datetime.utcnow().isoformat(),
             "votes": votes,
             "aiSummary": vote_summary,
             "participationRate": participation_rate,
         }
 
-        await s3_client.put_json(
-            f"votes/{official_id}/{datetime.utcnow().year}.json",
-            votes_data,
-        )
+        await s3_client.put_json(votes_key, votes_data, metadata={"votes-sha256": votes_hash})
 
         logger.info("official_scraped", official_id=official_id)
         return official_data
@@ -211,41 +225,49 @@ class JobService:
             )
             job.result = JobResult()
 
-            # Process in batches
+            # Feed members to a fixed pool of workers; one None sentinel per worker
             from app.core.config import settings
-            semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_SCRAPES)
+            worker_count = settings.MAX_CONCURRENT_SCRAPES
+            queue: asyncio.Queue = asyncio.Queue()
+            for member in all_members:
+                queue.put_nowait(member)
+            for _ in range(worker_count):
+                queue.put_nowait(None)
 
             async def process_member(member):
-                async with semaphore:
-                    try:
-                        official_id = f"{member['state'].lower()}-{member.get('district', 'sen')}"
-                        await self.scrape_official(member["id"], official_id)
-
-                        job.progress.completed += 1
-                        job.result.officialsUpdated += 1
-
-                        # Trigger ISR revalidation
-                        await isr_service.revalidate_official(
-                            official_id, member["state"].lower()
+                try:
+                    official_id = f"{member['state'].lower()}-{member.get('district', 'sen')}"
+                    await self.scrape_official(member["id"], official_id)
+
+                    job.progress.completed += 1
+                    job.result.officialsUpdated += 1
+
+                    # Trigger ISR revalidation
+                    await isr_service.revalidate_official(
+                        official_id, member["state"].lower()
+                    )
+                    job.result.isrTriggered = True
+
+                    # Update job progress every 10 officials
+                    if job.progress.completed % 10 == 0:
+                        await self.update_job(job)
+
+                except Exception as e:
+                    job.progress.failed += 1
+                    job.errors.append(
+                        JobError(
+                            officialId=official_id,
+                            error=str(e),
                         )
-                        job.result.isrTriggered = True
-
-                        # Update job progress every 10 officials
-                        if job.progress.completed % 10 == 0:
-                            await self.update_job(job)
-
-                    except Exception as e:
-                        job.progress.failed += 1
-                        job.errors.append(
-                            JobError(
-                                officialId=official_id,
-                                error=str(e),
-                            )
-                        )
-                        logger.error("member_scrape_failed", member_id=member["id"], error=str(e))
+                    )
+                    logger.error("member_scrape_failed", member_id=member["id"], error=str(e))
+
+            async def worker():
+                while (member := await queue.get()) is not None:
+                    await process_member(member)
 
             # Process all members
-            await asyncio.gather(*[process_member(m) for m in all_members])
+            await asyncio.gather(*[worker() for _ in range(worker_count)])
 
             job.status = "completed"
             job.completedAt = datetime.utcnow()
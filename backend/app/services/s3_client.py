@@ -2,19 +2,217 @@
 S3 client service for reading and writing JSON files.
 """
 
-import json
+import asyncio
+import gzip
 import hashlib
-from typing import Any, Optional, Dict
-from datetime import datetime
+import random
+import re
+import string
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Dict, List, Set, Tuple, Type, TypeVar
+from datetime import datetime, timezone
+from urllib.parse import quote
 import aioboto3
+import httpx
+from aiobotocore.config import AioConfig
+import orjson
+from botocore.auth import S3SigV4Auth
+from botocore.awsrequest import AWSRequest
+from botocore.credentials import Credentials
 from botocore.exceptions import ClientError
+from pydantic import BaseModel
 
 from app.core.config import settings
 from app.core.logging import get_logger
 from app.core.exceptions import S3Error, NotFoundError
+from app.models.metadata import MetadataRecord
 
 logger = get_logger(__name__)
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+_ERROR_CODE_RE = re.compile(rb"<Code>([^<]+)</Code>")
+# Error codes worth retrying besides any 5xx status
+_RETRYABLE_ERROR_CODES = {"SlowDown", "RequestTimeout", "Throttling", "ThrottlingException"}
+# Error codes meaning S3 Select is not offered for the bucket at all
+_SELECT_UNAVAILABLE_CODES = {"MethodNotAllowed", "NotImplemented"}
+# Every character a URL-safe key segment can start with (IDs, base64url tokens)
+_URLSAFE_SHARDS = string.digits + string.ascii_uppercase + string.ascii_lowercase + "-_"
+
+# (epoch second, ISO timestamp) of the last formatted tick
+_ts_cache: Tuple[int, str] = (0, "")
+
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO 8601 string, formatted once per second."""
+    global _ts_cache
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache = (now, datetime.fromtimestamp(now, tz=timezone.utc).isoformat(timespec="seconds"))
+    return _ts_cache[1]
+
+
+class _RawBody:
+    """Already-downloaded response body exposing the aiobotocore read() API."""
+
+    def __init__(self, content: bytes):
+        self._content = content
+
+    async def read(self) -> bytes:
+        return self._content
+
+
+class _SignedS3Client:
+    """
+    Minimal S3 client for single-key object operations.
+
+    Sends SigV4-signed requests over a shared httpx connection pool, skipping
+    aiobotocore's per-call model validation. Methods mirror the aiobotocore
+    client's keyword arguments and response shape, and failures raise the
+    same ClientError codes, so S3Client can use either client interchangeably.
+    Throttling, 5xx responses and connection errors are retried up to
+    RETRY_ATTEMPTS times with jittered exponential backoff.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self._signer = S3SigV4Auth(
+            Credentials(
+                settings.AWS_ACCESS_KEY_ID,
+                settings.AWS_SECRET_ACCESS_KEY,
+                settings.AWS_SESSION_TOKEN,
+            ),
+            "s3",
+            settings.AWS_REGION,
+        )
+        self._http = httpx.AsyncClient(
+            timeout=settings.REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=100, max_connections=100),
+            transport=transport,
+        )
+        self._max_attempts = settings.RETRY_ATTEMPTS + 1
+        self._retry_base_delay = 0.1
+
+    async def close(self):
+        await self._http.aclose()
+
+    async def _request(
+        self,
+        operation: str,
+        method: str,
+        bucket: str,
+        key: str,
+        body: bytes = b"",
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[httpx.Response, bytes]:
+        """Sign and send a request with retries, returning the response and its raw body."""
+        url = f"https://{bucket}.s3.{settings.AWS_REGION}.amazonaws.com/{quote(key, safe='/~')}"
+
+        for attempt in range(1, self._max_attempts + 1):
+            try:
+                response, content = await self._send(method, url, body, headers)
+            except httpx.TransportError:
+                if attempt == self._max_attempts:
+                    raise
+                await self._backoff(attempt)
+                continue
+
+            if response.status_code < 300:
+                return response, content
+
+            match = _ERROR_CODE_RE.search(content)
+            code = match.group(1).decode() if match else str(response.status_code)
+            retryable = response.status_code >= 500 or code in _RETRYABLE_ERROR_CODES
+            if retryable and attempt < self._max_attempts:
+                logger.debug("s3_signed_request_retry", key=key, code=code, attempt=attempt)
+                await self._backoff(attempt)
+                continue
+
+            raise ClientError(
+                {
+                    "Error": {"Code": code, "Message": response.reason_phrase},
+                    "ResponseMetadata": {"HTTPStatusCode": response.status_code},
+                },
+                operation,
+            )
+
+    async def _send(
+        self, method: str, url: str, body: bytes, headers: Optional[Dict[str, str]]
+    ) -> Tuple[httpx.Response, bytes]:
+        """Sign and send a single attempt (signatures are time-stamped, so sign per attempt)."""
+        request = AWSRequest(method=method, url=url, data=body, headers=headers or {})
+        self._signer.add_auth(request)
+
+        response = await self._http.send(
+            self._http.build_request(method, url, headers=dict(request.headers.items()), content=body),
+            stream=True,
+        )
+        try:
+            # Raw bytes: gzip bodies are decoded by the caller, not by httpx
+            content = b"".join([chunk async for chunk in response.aiter_raw()])
+        finally:
+            await response.aclose()
+
+        return response, content
+
+    async def _backoff(self, attempt: int):
+        """Sleep with full jitter before retry number `attempt`."""
+        await asyncio.sleep(random.uniform(0, min(self._retry_base_delay * 2 ** attempt, 5.0)))
+
+    @staticmethod
+    def _user_metadata(response: httpx.Response) -> Dict[str, str]:
+        return {
+            name[len("x-amz-meta-"):]: value
+            for name, value in response.headers.items()
+            if name.startswith("x-amz-meta-")
+        }
+
+    async def get_object(self, Bucket: str, Key: str, IfNoneMatch: Optional[str] = None):
+        headers = {"If-None-Match": IfNoneMatch} if IfNoneMatch else None
+        response, content = await self._request("GetObject", "GET", Bucket, Key, headers=headers)
+        return {
+            "Body": _RawBody(content),
+            "ETag": response.headers.get("etag"),
+            "ContentEncoding": response.headers.get("content-encoding"),
+            "ContentLength": len(content),
+            "Metadata": self._user_metadata(response),
+        }
+
+    async def put_object(
+        self,
+        Bucket: str,
+        Key: str,
+        Body: bytes,
+        ContentType: Optional[str] = None,
+        CacheControl: Optional[str] = None,
+        ContentEncoding: Optional[str] = None,
+        Metadata: Optional[Dict[str, str]] = None,
+    ):
+        headers = {}
+        if ContentType:
+            headers["Content-Type"] = ContentType
+        if CacheControl:
+            headers["Cache-Control"] = CacheControl
+        if ContentEncoding:
+            headers["Content-Encoding"] = ContentEncoding
+        for name, value in (Metadata or {}).items():
+            headers[f"x-amz-meta-{name}"] = value
+
+        response, _ = await self._request("PutObject", "PUT", Bucket, Key, body=Body, headers=headers)
+        return {"ETag": response.headers.get("etag")}
+
+    async def delete_object(self, Bucket: str, Key: str):
+        await self._request("DeleteObject", "DELETE", Bucket, Key)
+        return {}
+
+    async def head_object(self, Bucket: str, Key: str):
+        response, _ = await self._request("HeadObject", "HEAD", Bucket, Key)
+        return {
+            "ETag": response.headers.get("etag"),
+            "ContentLength": int(response.headers.get("content-length", 0)),
+            "ContentEncoding": response.headers.get("content-encoding"),
+            "Metadata": self._user_metadata(response),
+        }
+
 
 class S3Client:
     """Async S3 client for JSON file operations."""
@@ -24,8 +222,151 @@ class S3Client:
         self.session = aioboto3.Session(
             aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
             aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+            aws_session_token=settings.AWS_SESSION_TOKEN,
             region_name=settings.AWS_REGION,
         )
+        # Pool sized for the gather-based fan-outs (the default is 10 connections)
+        self._client_config = AioConfig(
+            max_pool_connections=100,
+            retries={"max_attempts": settings.RETRY_ATTEMPTS, "mode": "adaptive"},
+            s3={"addressing_style": "virtual"},
+            connector_args={"keepalive_timeout": 60},
+        )
+        self._client_ctx = None
+        self._client = None
+        self._client_lock = asyncio.Lock()
+        self._signed_client: Optional[_SignedS3Client] = None
+        self._exists_cache: Dict[str, Tuple[Set[str], float]] = {}  # prefix -> (keys, expiry)
+        # key -> (ETag, raw JSON bytes), least recently used first; bounded by
+        # total body size, and large bodies are never cached
+        self._etag_cache: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+        self._etag_cache_bytes = 0
+        self._etag_cache_max_bytes = 32 << 20
+        self._etag_cache_max_entry_bytes = 256 << 10
+        self._stream_read_threshold = 1 << 20
+        self._select_unavailable = False
+
+    async def _get_client(self):
+        """Get the shared S3 client, creating it on first use."""
+        if self._client is None:
+            async with self._client_lock:
+                if self._client is None:
+                    client_ctx = self.session.client("s3", config=self._client_config)
+                    self._client = await client_ctx.__aenter__()
+                    self._client_ctx = client_ctx
+        return self._client
+
+    async def _get_object_client(self):
+        """
+        Get the client for single-key get/put/delete/head operations.
+
+        With S3_SIGNED_HTTP enabled this is the lightweight signed-request
+        client; listing, batch deletes and Select stay on aioboto3.
+        """
+        if not settings.S3_SIGNED_HTTP:
+            return await self._get_client()
+        if self._signed_client is None:
+            self._signed_client = _SignedS3Client()
+        return self._signed_client
+
+    async def close(self):
+        """Close the shared S3 clients."""
+        if self._client_ctx is not None:
+            await self._client_ctx.__aexit__(None, None, None)
+            self._client_ctx = None
+            self._client = None
+        if self._signed_client is not None:
+            await self._signed_client.close()
+            self._signed_client = None
+
+    def _track_key(self, key: str, present: bool):
+        """Keep loaded prefix key sets in sync with a write or delete."""
+        for prefix, (keys, _) in self._exists_cache.items():
+            if key.startswith(prefix):
+                if present:
+                    keys.add(key)
+                else:
+                    keys.discard(key)
+
+    def _forget_etag(self, key: str):
+        """Drop a key from the conditional-GET cache."""
+        entry = self._etag_cache.pop(key, None)
+        if entry is not None:
+            self._etag_cache_bytes -= len(entry[1])
+
+    def _remember_etag(self, key: str, etag: Optional[str], content: bytes):
+        """Cache the raw body of a key under its ETag for conditional GETs."""
+        self._forget_etag(key)
+        if not etag or len(content) > self._etag_cache_max_entry_bytes:
+            return
+
+        self._etag_cache[key] = (etag, content)
+        self._etag_cache_bytes += len(content)
+        while self._etag_cache_bytes > self._etag_cache_max_bytes:
+            _, (_, evicted) = self._etag_cache.popitem(last=False)
+            self._etag_cache_bytes -= len(evicted)
+
+    async def _read_body(self, response: Dict[str, Any]) -> bytes:
+        """Read a GetObject body, streaming large objects into a presized buffer."""
+        body = response["Body"]
+        size = int(response.get("ContentLength") or 0)
+
+        # Small or unknown-size bodies, and bodies that are already in memory
+        # (the signed-request client), are read in one go
+        if size <= self._stream_read_threshold or not hasattr(body, "iter_chunks"):
+            return await body.read()
+
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        offset = 0
+        async for chunk in body.iter_chunks(1 << 16):
+            view[offset:offset + len(chunk)] = chunk
+            offset += len(chunk)
+        view.release()
+
+        return buffer if offset == size else buffer[:offset]
+
+    async def _get_bytes(self, key: str) -> Optional[bytes]:
+        """
+        Read the raw (decompressed) JSON bytes of an object.
+
+        Keys read before are fetched with If-None-Match, so an unchanged
+        object comes back as a bodyless 304 and is served from the cache.
+        """
+        cached = self._etag_cache.get(key)
+        get_args = {"Bucket": self.bucket, "Key": key}
+        if cached:
+            get_args["IfNoneMatch"] = cached[0]
+
+        try:
+            s3 = await self._get_object_client()
+            response = await s3.get_object(**get_args)
+            content = await self._read_body(response)
+            if response.get("ContentEncoding") == "gzip":
+                content = gzip.decompress(content)
+            self._remember_etag(key, response.get("ETag"), content)
+
+            logger.debug("s3_read_success", key=key, size=len(content))
+            return content
+
+        except ClientError as e:
+            error_code = e.response["Error"]["Code"]
+            if error_code in ("304", "NotModified") and cached:
+                # The entry may have been evicted or dropped while the GET was in flight
+                if self._etag_cache.get(key) is cached:
+                    self._etag_cache.move_to_end(key)
+                logger.debug("s3_read_not_modified", key=key)
+                return cached[1]
+            if error_code == "NoSuchKey":
+                self._forget_etag(key)
+                logger.debug("s3_key_not_found", key=key)
+                return None
+            logger.error("s3_read_error", key=key, error=str(e))
+            raise S3Error(f"Failed to read from S3: {key}") from e
+
+        except Exception as e:
+            logger.error("s3_unexpected_error", key=key, error=str(e))
+            raise S3Error(f"Unexpected error reading from S3: {key}") from e
 
     async def get_json(self, key: str) -> Optional[Dict[str, Any]]:
         """
@@ -40,26 +381,125 @@ class S3Client:
         Raises:
             S3Error: If S3 operation fails
         """
+        content = await self._get_bytes(key)
+        if content is None:
+            return None
+
         try:
-            async with self.session.client("s3") as s3:
-                response = await s3.get_object(Bucket=self.bucket, Key=key)
-                content = await response["Body"].read()
-                data = json.loads(content.decode("utf-8"))
+            return orjson.loads(content)
+        except orjson.JSONDecodeError as e:
+            logger.error("s3_unexpected_error", key=key, error=str(e))
+            raise S3Error(f"Unexpected error reading from S3: {key}") from e
+
+    async def get_typed(self, key: str, model: Type[ModelT]) -> Optional[ModelT]:
+        """
+        Read a JSON file from S3 directly into a Pydantic model.
+
+        The bytes are validated by pydantic-core without building an
+        intermediate dict. Use get_json for free-form payloads.
 
-                logger.debug("s3_read_success", key=key, size=len(content))
-                return data
+        Args:
+            key: S3 object key (path)
+            model: Pydantic model class to validate into
+
+        Returns:
+            Model instance or None if not found
+
+        Raises:
+            S3Error: If S3 operation fails
+            pydantic.ValidationError: If the JSON doesn't match the model
+        """
+        content = await self._get_bytes(key)
+        if content is None:
+            return None
+        return model.model_validate_json(content)
+
+    async def get_json_fields(
+        self, key: str, fields: List[str], compressed: Optional[bool] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Read selected top-level fields of a JSON file using S3 Select.
+
+        Only the selected fields are transferred. If S3 Select is not
+        available for the bucket, the full object is read instead, and
+        later calls skip straight to the full read.
+
+        Args:
+            key: S3 object key (path)
+            fields: Top-level field names to return
+            compressed: Whether the object is stored gzipped, if the caller
+                already knows; otherwise it is looked up with a HEAD request
+
+        Returns:
+            Dictionary of the fields present in the object, or None if not found
+
+        Raises:
+            S3Error: If S3 operation fails
+        """
+        for field in fields:
+            if not field.replace("_", "").isalnum():
+                raise ValueError(f"Invalid JSON field name: {field}")
+
+        if self._select_unavailable:
+            return await self._get_json_fields_full(key, fields)
+
+        if compressed is None:
+            head = await self.head(key)
+            if head is None:
+                return None
+            compressed = head.get("ContentEncoding") == "gzip"
+
+        columns = ", ".join(f's."{field}"' for field in fields)
+        input_serialization = {"JSON": {"Type": "DOCUMENT"}}
+        if compressed:
+            # put_json gzips larger bodies; Select must be told to inflate them
+            input_serialization["CompressionType"] = "GZIP"
+
+        try:
+            s3 = await self._get_client()
+            response = await s3.select_object_content(
+                Bucket=self.bucket,
+                Key=key,
+                ExpressionType="SQL",
+                Expression=f"SELECT {columns} FROM s3object s",
+                InputSerialization=input_serialization,
+                OutputSerialization={"JSON": {}},
+            )
+
+            content = b""
+            async for event in response["Payload"]:
+                if "Records" in event:
+                    content += event["Records"]["Payload"]
+
+            record = content.strip().split(b"\n", 1)[0]
+            data = orjson.loads(record) if record else {}
+
+            logger.debug("s3_select_success", key=key, size=len(content))
+            return data
 
         except ClientError as e:
             error_code = e.response["Error"]["Code"]
             if error_code == "NoSuchKey":
                 logger.debug("s3_key_not_found", key=key)
                 return None
-            logger.error("s3_read_error", key=key, error=str(e))
-            raise S3Error(f"Failed to read from S3: {key}") from e
+            if error_code not in _SELECT_UNAVAILABLE_CODES:
+                logger.error("s3_select_error", key=key, error_code=error_code, error=str(e))
+                raise S3Error(f"Failed to select from S3: {key}") from e
+            logger.warning("s3_select_unavailable", key=key, error=str(e))
+            self._select_unavailable = True
 
         except Exception as e:
             logger.error("s3_unexpected_error", key=key, error=str(e))
-            raise S3Error(f"Unexpected error reading from S3: {key}") from e
+            raise S3Error(f"Unexpected error selecting from S3: {key}") from e
+
+        return await self._get_json_fields_full(key, fields)
+
+    async def _get_json_fields_full(self, key: str, fields: List[str]) -> Optional[Dict[str, Any]]:
+        """Read the full JSON object and keep only the requested fields."""
+        data = await self.get_json(key)
+        if data is None:
+            return None
+        return {field: data[field] for field in fields if field in data}
 
     async def put_json(
         self,
@@ -67,42 +507,72 @@ class S3Client:
         data: Dict[str, Any],
         metadata: Optional[Dict[str, str]] = None,
         cache_control: str = "max-age=3600",
+        skip_unchanged: bool = False,
     ) -> bool:
         """
         Write a JSON file to S3.
 
+        The body is serialized with sorted keys so identical data always
+        produces identical bytes, and its SHA256 is stored as the "sha256"
+        object metadata unless the caller supplies one.
+
         Args:
             key: S3 object key (path)
             data: Data to write (will be JSON serialized)
             metadata: Optional metadata to attach
             cache_control: Cache-Control header value
+            skip_unchanged: If True, skip the upload when the stored object's
+                "sha256" metadata already matches
 
         Returns:
-            True if successful
+            True if successful (including skipped unchanged writes)
 
         Raises:
             S3Error: If S3 operation fails
         """
         try:
-            async with self.session.client("s3") as s3:
-                json_data = json.dumps(data, indent=2, default=str)
-                json_bytes = json_data.encode("utf-8")
-
-                put_args = {
-                    "Bucket": self.bucket,
-                    "Key": key,
-                    "Body": json_bytes,
-                    "ContentType": "application/json",
-                    "CacheControl": cache_control,
-                }
-
-                if metadata:
-                    put_args["Metadata"] = metadata
-
-                await s3.put_object(**put_args)
-
-                logger.info("s3_write_success", key=key, size=len(json_bytes))
-                return True
+            s3 = await self._get_object_client()
+            json_bytes = orjson.dumps(
+                data,
+                default=str,
+                option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+            )
+            object_metadata = {"sha256": self.compute_hash_bytes(json_bytes), **(metadata or {})}
+
+            if skip_unchanged:
+                try:
+                    head = await s3.head_object(Bucket=self.bucket, Key=key)
+                    if head.get("Metadata", {}).get("sha256") == object_metadata["sha256"]:
+                        logger.debug("s3_write_skipped_unchanged", key=key)
+                        return True
+                except ClientError:
+                    pass
+
+            put_args = {
+                "Bucket": self.bucket,
+                "Key": key,
+                "Body": json_bytes,
+                "ContentType": "application/json",
+                "CacheControl": cache_control,
+                "Metadata": object_metadata,
+            }
+
+            # Small bodies aren't worth the gzip framing overhead
+            if len(json_bytes) > 1024:
+                put_args["Body"] = gzip.compress(json_bytes, compresslevel=1, mtime=0)
+                put_args["ContentEncoding"] = "gzip"
+
+            await s3.put_object(**put_args)
+            self._track_key(key, present=True)
+            self._forget_etag(key)
+
+            logger.info(
+                "s3_write_success",
+                key=key,
+                size=len(json_bytes),
+                stored_size=len(put_args["Body"]),
+            )
+            return True
 
         except Exception as e:
             logger.error("s3_write_error", key=key, error=str(e))
@@ -119,55 +589,260 @@ class S3Client:
             True if successful
         """
         try:
-            async with self.session.client("s3") as s3:
-                await s3.delete_object(Bucket=self.bucket, Key=key)
-                logger.info("s3_delete_success", key=key)
-                return True
+            s3 = await self._get_object_client()
+            await s3.delete_object(Bucket=self.bucket, Key=key)
+            self._track_key(key, present=False)
+            self._forget_etag(key)
+            logger.info("s3_delete_success", key=key)
+            return True
 
         except Exception as e:
             logger.error("s3_delete_error", key=key, error=str(e))
             raise S3Error(f"Failed to delete from S3: {key}") from e
 
-    async def exists(self, key: str) -> bool:
-        """Check if an object exists in S3."""
+    async def delete_many(self, keys: List[str]) -> bool:
+        """
+        Delete multiple objects from S3 in batches of up to 1000 keys.
+
+        Args:
+            keys: S3 object keys (paths)
+
+        Returns:
+            True if every key was deleted
+        """
+        success = True
+
+        for i in range(0, len(keys), 1000):
+            chunk = keys[i:i + 1000]
+            try:
+                s3 = await self._get_client()
+                response = await s3.delete_objects(
+                    Bucket=self.bucket,
+                    Delete={"Objects": [{"Key": k} for k in chunk], "Quiet": True},
+                )
+
+                errors = response.get("Errors", [])
+                failed_keys = {err.get("Key") for err in errors}
+                for k in chunk:
+                    if k not in failed_keys:
+                        self._track_key(k, present=False)
+                        self._forget_etag(k)
+                if errors:
+                    success = False
+                    logger.warning(
+                        "s3_delete_many_partial",
+                        count=len(chunk),
+                        failed=sorted(failed_keys),
+                    )
+                else:
+                    logger.info("s3_delete_many_success", count=len(chunk))
+
+            except Exception as e:
+                logger.error("s3_delete_many_error", count=len(chunk), error=str(e))
+                raise S3Error(f"Failed to delete {len(chunk)} keys from S3") from e
+
+        return success
+
+    async def ensure_prefix_loaded(self, prefix: str, ttl: float = 60) -> None:
+        """
+        Load all keys under a prefix so exists() can answer from memory.
+
+        Args:
+            prefix: Key prefix to load (e.g., "metadata/")
+            ttl: Seconds before the loaded key set is considered stale
+        """
+        cached = self._exists_cache.get(prefix)
+        if cached and time.monotonic() < cached[1]:
+            return
+
+        keys = await self.list_keys(prefix)
+        self._exists_cache[prefix] = (set(keys), time.monotonic() + ttl)
+
+    async def exists(self, key: str, prefix_hint: Optional[str] = None) -> bool:
+        """
+        Check if an object exists in S3.
+
+        Args:
+            key: S3 object key (path)
+            prefix_hint: Prefix preloaded with ensure_prefix_loaded; if its key
+                set is fresh, the check is answered without a HEAD request
+
+        Returns:
+            True if the object exists
+        """
+        if prefix_hint is not None and key.startswith(prefix_hint):
+            cached = self._exists_cache.get(prefix_hint)
+            if cached and time.monotonic() < cached[1]:
+                return key in cached[0]
+
         try:
-            async with self.session.client("s3") as s3:
-                await s3.head_object(Bucket=self.bucket, Key=key)
-                return True
+            s3 = await self._get_object_client()
+            await s3.head_object(Bucket=self.bucket, Key=key)
+            return True
         except ClientError:
             return False
 
+    async def head(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Read an object's headers and user metadata with a HEAD request.
+
+        Args:
+            key: S3 object key (path)
+
+        Returns:
+            HEAD response ("ETag", "ContentEncoding", "Metadata", ...), or
+            None if not found
+
+        Raises:
+            S3Error: If S3 operation fails
+        """
+        try:
+            s3 = await self._get_object_client()
+            return await s3.head_object(Bucket=self.bucket, Key=key)
+
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                return None
+            logger.error("s3_head_error", key=key, error=str(e))
+            raise S3Error(f"Failed to read S3 metadata: {key}") from e
+
+        except Exception as e:
+            logger.error("s3_unexpected_error", key=key, error=str(e))
+            raise S3Error(f"Unexpected error reading S3 metadata: {key}") from e
+
     async def list_keys(self, prefix: str) -> list[str]:
-        """List all keys with the given prefix."""
+        """
+        List all keys with the given prefix.
+
+        Pages are fetched by a producer task into a small queue, so the next
+        page request is in flight while the current one is processed.
+        """
         try:
-            async with self.session.client("s3") as s3:
-                paginator = s3.get_paginator("list_objects_v2")
-                keys = []
+            s3 = await self._get_client()
+            paginator = s3.get_paginator("list_objects_v2")
+            pages: asyncio.Queue = asyncio.Queue(maxsize=2)
+            keys = []
 
+            async def fetch_pages():
                 async for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+                    await pages.put(page)
+                await pages.put(None)
+
+            async with asyncio.TaskGroup() as task_group:
+                task_group.create_task(fetch_pages())
+                while (page := await pages.get()) is not None:
                     if "Contents" in page:
                         keys.extend([obj["Key"] for obj in page["Contents"]])
 
-                logger.debug("s3_list_success", prefix=prefix, count=len(keys))
-                return keys
+            logger.debug("s3_list_success", prefix=prefix, count=len(keys))
+            return keys
 
         except Exception as e:
+            # TaskGroup wraps the producer's failure; report the real error
+            if isinstance(e, ExceptionGroup):
+                e = e.exceptions[0]
             logger.error("s3_list_error", prefix=prefix, error=str(e))
             raise S3Error(f"Failed to list S3 keys: {prefix}") from e
 
-    def compute_hash(self, data: Dict[str, Any]) -> str:
+    async def list_keys_sharded(
+        self,
+        prefix: str,
+        shards: str = _URLSAFE_SHARDS,
+    ) -> list[str]:
+        """
+        List all keys with the given prefix, paginating shards concurrently.
+
+        Each shard lists ``prefix + shard``, so every key under the prefix must
+        continue with one of the shard characters. The default covers the
+        URL-safe alphabet (letters, digits, "-" and "_"), which includes
+        official IDs, job IDs and session tokens. Use list_keys for arbitrary
+        key layouts.
+
+        Args:
+            prefix: Key prefix to list (e.g., "metadata/")
+            shards: Characters that the remainder of each key starts with
+
+        Returns:
+            All matching keys, in shard order
+        """
+        try:
+            s3 = await self._get_client()
+
+            async def list_shard(shard: str) -> list[str]:
+                paginator = s3.get_paginator("list_objects_v2")
+                shard_keys = []
+                async for page in paginator.paginate(Bucket=self.bucket, Prefix=f"{prefix}{shard}"):
+                    if "Contents" in page:
+                        shard_keys.extend([obj["Key"] for obj in page["Contents"]])
+                return shard_keys
+
+            results = await asyncio.gather(*[list_shard(shard) for shard in shards])
+            keys = [key for shard_keys in results for key in shard_keys]
+
+            logger.debug("s3_list_success", prefix=prefix, count=len(keys), shards=len(shards))
+            return keys
+
+        except Exception as e:
+            logger.error("s3_list_error", prefix=prefix, error=str(e))
+            raise S3Error(f"Failed to list S3 keys: {prefix}") from e
+
+    def compute_hash(self, data: Any) -> str:
         """Compute SHA256 hash of JSON data for change detection."""
-        json_str = json.dumps(data, sort_keys=True, default=str)
-        return hashlib.sha256(json_str.encode()).hexdigest()
+        json_bytes = orjson.dumps(
+            data,
+            default=str,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+        )
+        return self.compute_hash_bytes(json_bytes)
+
+    def compute_hash_bytes(self, data: bytes) -> str:
+        """Compute SHA256 hash of already-serialized bytes."""
+        return hashlib.sha256(data).hexdigest()
 
-    async def get_metadata(self, official_id: str) -> Optional[Dict[str, Any]]:
+    async def get_metadata(self, official_id: str) -> Optional[MetadataRecord]:
         """Get metadata for an official (includes data hashes)."""
-        return await self.get_json(f"metadata/{official_id}.json")
+        return await self.get_typed(f"metadata/{official_id}.json", MetadataRecord)
+
+    async def get_metadata_many(
+        self, official_ids: List[str], concurrency: int = 64
+    ) -> Dict[str, Optional[MetadataRecord]]:
+        """
+        Get metadata for many officials concurrently.
+
+        Prefer this over awaiting get_metadata in a loop when syncing many
+        officials; at most `concurrency` reads are in flight at once.
+
+        Args:
+            official_ids: Official IDs (e.g., ["ca-12", "tx-sen"])
+            concurrency: Maximum number of concurrent S3 reads
+
+        Returns:
+            Dictionary mapping official ID to metadata (None if missing)
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(official_id: str):
+            async with semaphore:
+                return official_id, await self.get_metadata(official_id)
 
-    async def save_metadata(self, official_id: str, metadata: Dict[str, Any]) -> bool:
-        """Save metadata for an official."""
-        metadata["lastUpdated"] = datetime.utcnow().isoformat()
-        return await self.put_json(f"metadata/{official_id}.json", metadata)
+        results = await asyncio.gather(*[fetch(official_id) for official_id in official_ids])
+        return dict(results)
+
+    async def get_metadata_hash(self, official_id: str) -> Optional[Dict[str, Any]]:
+        """Get only the hash and lastUpdated fields of an official's metadata."""
+        return await self.get_json_fields(
+            f"metadata/{official_id}.json", ["hash", "lastUpdated"]
+        )
+
+    async def save_metadata(self, official_id: str, metadata: MetadataRecord) -> bool:
+        """Save metadata for an official, skipping the write if only lastUpdated would change."""
+        payload = metadata.model_dump(mode="json", exclude={"lastUpdated"})
+        return await self.put_json(
+            f"metadata/{official_id}.json",
+            {**payload, "lastUpdated": _now_iso()},
+            metadata={"sha256": self.compute_hash(payload)},
+            skip_unchanged=True,
+        )
 
 
 # Singleton instance
@@ -0,0 +1,148 @@
+"""
+Shared test fixtures.
+"""
+
+import gzip
+import hashlib
+import re
+
+import orjson
+import pytest
+from botocore.exceptions import ClientError
+
+from app.services.s3_client import S3Client
+
+
+class FakeBody:
+    """Minimal stand-in for an aiobotocore streaming body."""
+
+    def __init__(self, content: bytes):
+        self.content = content
+
+    async def read(self) -> bytes:
+        return self.content
+
+    async def iter_chunks(self, chunk_size: int):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+
+class FakePaginator:
+    """Stand-in for a list_objects_v2 paginator over FakeS3's objects."""
+
+    def __init__(self, s3: "FakeS3", page_size: int = 2):
+        self.s3 = s3
+        self.page_size = page_size
+
+    async def paginate(self, Bucket, Prefix):
+        self.s3.calls.append(("list_objects_v2", Prefix))
+        if self.s3.list_error:
+            raise self.s3._error(self.s3.list_error, "ListObjectsV2")
+        keys = sorted(key for key in self.s3.objects if key.startswith(Prefix))
+        for start in range(0, len(keys), self.page_size):
+            yield {"Contents": [{"Key": key} for key in keys[start:start + self.page_size]]}
+
+
+class FakeS3:
+    """In-memory stand-in for the aiobotocore S3 client."""
+
+    def __init__(self):
+        self.objects = {}
+        self.calls = []
+        self.select_error = "MethodNotAllowed"  # S3 Select is off by default
+        self.list_error = None
+        self.undeletable = set()  # keys delete_objects reports as failed
+
+    def _error(self, code: str, operation: str):
+        return ClientError({"Error": {"Code": code, "Message": code}}, operation)
+
+    async def get_object(self, Bucket, Key, IfNoneMatch=None):
+        self.calls.append(("get_object", Key))
+        if Key not in self.objects:
+            raise self._error("NoSuchKey", "GetObject")
+        obj = self.objects[Key]
+        if IfNoneMatch == obj["ETag"]:
+            raise self._error("304", "GetObject")
+        return {
+            "Body": FakeBody(obj["Body"]),
+            "ETag": obj["ETag"],
+            "ContentEncoding": obj.get("ContentEncoding"),
+            "ContentLength": obj.get("ContentLength", len(obj["Body"])),
+            "Metadata": obj.get("Metadata", {}),
+        }
+
+    async def select_object_content(self, Bucket, Key, Expression, InputSerialization, **kwargs):
+        self.calls.append(("select_object_content", Key))
+        if self.select_error:
+            raise self._error(self.select_error, "SelectObjectContent")
+        if Key not in self.objects:
+            raise self._error("NoSuchKey", "SelectObjectContent")
+
+        body = self.objects[Key]["Body"]
+        if InputSerialization.get("CompressionType") == "GZIP":
+            body = gzip.decompress(body)
+        try:
+            data = orjson.loads(body)
+        except orjson.JSONDecodeError:
+            raise self._error("JSONParsingError", "SelectObjectContent")
+
+        fields = re.findall(r's\."(\w+)"', Expression)
+        record = orjson.dumps({field: data[field] for field in fields if field in data})
+
+        async def payload():
+            yield {"Records": {"Payload": record + b"\n"}}
+            yield {"End": {}}
+
+        return {"Payload": payload()}
+
+    async def put_object(self, Bucket, Key, Body, **kwargs):
+        self.calls.append(("put_object", Key))
+        etag = f'"{hashlib.md5(Body).hexdigest()}"'
+        self.objects[Key] = {"Body": Body, "ETag": etag, **kwargs}
+        return {"ETag": etag}
+
+    async def head_object(self, Bucket, Key):
+        self.calls.append(("head_object", Key))
+        if Key not in self.objects:
+            raise self._error("404", "HeadObject")
+        obj = self.objects[Key]
+        return {
+            "ETag": obj["ETag"],
+            "ContentEncoding": obj.get("ContentEncoding"),
+            "Metadata": obj.get("Metadata", {}),
+        }
+
+    async def delete_object(self, Bucket, Key):
+        self.calls.append(("delete_object", Key))
+        self.objects.pop(Key, None)
+        return {}
+
+    async def delete_objects(self, Bucket, Delete):
+        keys = [obj["Key"] for obj in Delete["Objects"]]
+        self.calls.append(("delete_objects", len(keys)))
+        assert len(keys) <= 1000
+        errors = []
+        for key in keys:
+            if key in self.undeletable:
+                errors.append({"Key": key, "Code": "AccessDenied", "Message": "Access Denied"})
+            else:
+                self.objects.pop(key, None)
+        return {"Errors": errors} if errors else {}
+
+    def get_paginator(self, operation: str) -> FakePaginator:
+        return FakePaginator(self)
+
+    def count(self, operation: str) -> int:
+        return sum(1 for op, _ in self.calls if op == operation)
+
+
+@pytest.fixture
+def fake_s3():
+    return FakeS3()
+
+
+@pytest.fixture
+def client(fake_s3):
+    s3 = S3Client()
+    s3._client = fake_s3
+    return s3
@@ -0,0 +1,107 @@
+"""
+Tests for the job service.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from app.core.exceptions import S3Error
+from app.services import job_service as job_service_module
+from app.services.job_service import JobService
+
+MEMBER = {"name": "Jane Doe", "party": "D", "state": "CA", "district": "12"}
+# Large enough that put_json stores the votes file gzipped, as in production
+VOTES = [{"rollCall": i, "vote": ("yes", "no", "not-voting")[i % 3]} for i in range(100)]
+
+
+class FakeAIService:
+    """Records voting-record summary requests."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def summarize_voting_record(self, votes, official_name, participation_rate):
+        self.calls += 1
+        return "fresh summary"
+
+
+@pytest.fixture
+def ai(monkeypatch):
+    fake = FakeAIService()
+    monkeypatch.setattr(job_service_module, "ai_service", fake)
+    return fake
+
+
+@pytest.fixture
+def service(monkeypatch, client, fake_s3):
+    fake_s3.select_error = None
+    monkeypatch.setattr(job_service_module, "s3_client", client)
+    svc = JobService()
+
+    async def scrape_member(member_id):
+        return MEMBER
+
+    async def scrape_votes(member_id):
+        return VOTES
+
+    monkeypatch.setattr(svc.propublica, "scrape_member", scrape_member)
+    monkeypatch.setattr(svc.propublica, "scrape_votes", scrape_votes)
+    return svc
+
+
+def votes_key() -> str:
+    return f"votes/ca-12/{datetime.utcnow().year}.json"
+
+
+@pytest.mark.asyncio
+async def test_scrape_official_reuses_summary_for_unchanged_votes(service, client, fake_s3, ai):
+    """Test that an unchanged votes hash reuses the stored summary."""
+    await client.put_json(
+        votes_key(),
+        {"aiSummary": "stored summary", "votes": VOTES},
+        metadata={"votes-sha256": client.compute_hash(VOTES)},
+    )
+
+    assert fake_s3.objects[votes_key()]["ContentEncoding"] == "gzip"
+
+    await service.scrape_official("D000001", "ca-12")
+
+    assert ai.calls == 0
+    assert fake_s3.count("head_object") == 1
+    assert fake_s3.count("select_object_content") == 1
+    assert fake_s3.count("get_object") == 0
+    assert (await client.get_json(votes_key()))["aiSummary"] == "stored summary"
+
+
+@pytest.mark.asyncio
+async def test_scrape_official_regenerates_summary_for_changed_votes(service, client, ai):
+    """Test that a different votes hash regenerates the summary."""
+    await client.put_json(
+        votes_key(),
+        {"aiSummary": "stale summary", "votes": []},
+        metadata={"votes-sha256": client.compute_hash([])},
+    )
+
+    await service.scrape_official("D000001", "ca-12")
+
+    assert ai.calls == 1
+    stored = await client.get_json(votes_key())
+    assert stored["aiSummary"] == "fresh summary"
+    assert "votes-sha256" in client._client.objects[votes_key()]["Metadata"]
+
+
+@pytest.mark.asyncio
+async def test_scrape_official_regenerates_summary_when_lookup_fails(
+    monkeypatch, service, client, ai
+):
+    """Test that a failed summary lookup falls back to regenerating it."""
+
+    async def failing_head(key):
+        raise S3Error(f"Failed to read S3 metadata: {key}")
+
+    monkeypatch.setattr(client, "head", failing_head)
+
+    await service.scrape_official("D000001", "ca-12")
+
+    assert ai.calls == 1
@@ -0,0 +1,476 @@
+"""
+Tests for the S3 client service.
+"""
+
+import gzip
+from datetime import timezone
+
+import httpx
+import orjson
+import pytest
+from botocore.exceptions import ClientError
+
+from app.core.config import settings
+from app.core.exceptions import S3Error
+from app.models.metadata import MetadataRecord
+from app.services import s3_client as s3_client_module
+from app.services.s3_client import S3Client, _SignedS3Client
+from tests.conftest import FakeBody
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_serves_unchanged_object_from_cache(client, fake_s3):
+    """Test that a repeat read of an unchanged object uses the cached body."""
+    fake_s3.objects["a.json"] = {"Body": b'{"a": 1}', "ETag": '"e1"'}
+
+    assert await client.get_json("a.json") == {"a": 1}
+    assert await client.get_json("a.json") == {"a": 1}
+
+    assert fake_s3.count("get_object") == 2
+    assert "a.json" in client._etag_cache
+
+
+@pytest.mark.asyncio
+async def test_not_modified_survives_entry_dropped_mid_request(monkeypatch, client, fake_s3):
+    """Test that a 304 still serves the body if the cache entry was dropped meanwhile."""
+    fake_s3.objects["a.json"] = {"Body": b'{"a": 1}', "ETag": '"e1"'}
+    await client.get_json("a.json")
+    get_object = fake_s3.get_object
+
+    async def get_object_racing_forget(**kwargs):
+        client._forget_etag("a.json")
+        return await get_object(**kwargs)
+
+    monkeypatch.setattr(fake_s3, "get_object", get_object_racing_forget)
+
+    assert await client.get_json("a.json") == {"a": 1}
+    assert "a.json" not in client._etag_cache
+
+
+@pytest.mark.asyncio
+async def test_etag_cache_skips_large_bodies(client, fake_s3):
+    """Test that bodies above the per-entry limit are not cached."""
+    client._etag_cache_max_entry_bytes = 16
+    fake_s3.objects["big.json"] = {"Body": orjson.dumps({"x": "y" * 32}), "ETag": '"e1"'}
+
+    await client.get_json("big.json")
+
+    assert "big.json" not in client._etag_cache
+    assert client._etag_cache_bytes == 0
+
+
+@pytest.mark.asyncio
+async def test_etag_cache_evicts_by_total_size(client, fake_s3):
+    """Test that the least recently used entries are evicted past the byte budget."""
+    client._etag_cache_max_bytes = 20
+    for name in ("a", "b", "c"):
+        fake_s3.objects[f"{name}.json"] = {"Body": b'{"v": 12345}', "ETag": f'"{name}"'}
+        await client.get_json(f"{name}.json")
+
+    assert list(client._etag_cache) == ["c.json"]
+    assert client._etag_cache_bytes == len(b'{"v": 12345}')
+
+
+@pytest.mark.asyncio
+async def test_put_json_does_not_populate_etag_cache(client, fake_s3):
+    """Test that writes drop any cached body instead of caching the new one."""
+    fake_s3.objects["a.json"] = {"Body": b'{"a": 1}', "ETag": '"e1"'}
+    await client.get_json("a.json")
+
+    await client.put_json("a.json", {"a": 2})
+
+    assert "a.json" not in client._etag_cache
+    assert client._etag_cache_bytes == 0
+    assert await client.get_json("a.json") == {"a": 2}
+
+
+class FakeS3Endpoint:
+    """httpx mock transport handler emulating S3's REST object API."""
+
+    def __init__(self):
+        self.objects = {}
+        self.requests = []
+        self.failures = []  # (status, error code) responses to return first
+
+    def _response(self, status, body=b"", headers=None):
+        # Stream the body so the client can read it raw, as from a real socket
+        return httpx.Response(status, stream=httpx.ByteStream(body), headers=headers or {})
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        assert "authorization" in request.headers
+        assert "x-amz-content-sha256" in request.headers
+
+        if self.failures:
+            status, code = self.failures.pop(0)
+            return self._response(status, f"<Error><Code>{code}</Code></Error>".encode())
+
+        key = request.url.raw_path.decode()
+        obj = self.objects.get(key)
+
+        if request.method == "PUT":
+            headers = {
+                name: value
+                for name, value in request.headers.items()
+                if name.startswith("x-amz-meta-") or name == "content-encoding"
+            }
+            self.objects[key] = {"body": request.content, "headers": {**headers, "ETag": '"e1"'}}
+            return self._response(200, headers={"ETag": '"e1"'})
+
+        if request.method == "DELETE":
+            self.objects.pop(key, None)
+            return self._response(204)
+
+        if obj is None:
+            if request.method == "HEAD":
+                return self._response(404)
+            return self._response(404, b"<Error><Code>NoSuchKey</Code></Error>")
+
+        if request.headers.get("if-none-match") == obj["headers"]["ETag"]:
+            return self._response(304, headers={"ETag": obj["headers"]["ETag"]})
+
+        body = obj["body"] if request.method == "GET" else b""
+        return self._response(200, body, obj["headers"])
+
+
+@pytest.fixture
+def endpoint():
+    return FakeS3Endpoint()
+
+
+@pytest.fixture
+def signed_client(endpoint):
+    signed = _SignedS3Client(transport=httpx.MockTransport(endpoint))
+    signed._retry_base_delay = 0
+    s3 = S3Client()
+    s3._signed_client = signed
+    return s3
+
+
+@pytest.fixture
+def signed_http(monkeypatch):
+    monkeypatch.setattr(settings, "S3_SIGNED_HTTP", True)
+
+
+@pytest.mark.asyncio
+async def test_signed_client_round_trip(signed_http, signed_client, endpoint):
+    """Test get/put/head/delete through the signed-request client."""
+    data = {"items": ["x" * 50] * 50}
+
+    assert await signed_client.get_json("votes/ca-12/2024.json") is None
+    assert await signed_client.put_json("votes/ca-12/2024.json", data, metadata={"source": "test"})
+
+    stored = endpoint.objects["/votes/ca-12/2024.json"]
+    assert stored["headers"]["content-encoding"] == "gzip"
+    assert stored["headers"]["x-amz-meta-source"] == "test"
+    assert "x-amz-meta-sha256" in stored["headers"]
+
+    assert await signed_client.get_json("votes/ca-12/2024.json") == data
+    assert await signed_client.exists("votes/ca-12/2024.json")
+
+    await signed_client.delete("votes/ca-12/2024.json")
+    assert not await signed_client.exists("votes/ca-12/2024.json")
+
+
+@pytest.mark.asyncio
+async def test_signed_client_conditional_get(signed_http, signed_client, endpoint):
+    """Test that a 304 from the signed client is served from the ETag cache."""
+    endpoint.objects["/a.json"] = {"body": b'{"a": 1}', "headers": {"ETag": '"e1"'}}
+
+    assert await signed_client.get_json("a.json") == {"a": 1}
+    assert await signed_client.get_json("a.json") == {"a": 1}
+
+    assert endpoint.requests[-1].headers["if-none-match"] == '"e1"'
+
+
+@pytest.mark.asyncio
+async def test_signed_client_retries_slow_down(signed_http, signed_client, endpoint):
+    """Test that throttling and 5xx responses are retried."""
+    endpoint.objects["/a.json"] = {"body": b'{"a": 1}', "headers": {"ETag": '"e1"'}}
+    endpoint.failures = [(503, "SlowDown"), (500, "InternalError")]
+
+    assert await signed_client.get_json("a.json") == {"a": 1}
+    assert len(endpoint.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_signed_client_gives_up_after_max_attempts(signed_http, signed_client, endpoint):
+    """Test that persistent 5xx responses surface as an error."""
+    endpoint.failures = [(503, "SlowDown")] * 10
+
+    with pytest.raises(S3Error):
+        await signed_client.get_json("a.json")
+    assert len(endpoint.requests) == settings.RETRY_ATTEMPTS + 1
+
+
+@pytest.mark.asyncio
+async def test_signed_client_does_not_retry_client_errors(signed_http, signed_client, endpoint):
+    """Test that 4xx errors such as AccessDenied fail immediately."""
+    endpoint.failures = [(403, "AccessDenied")]
+
+    with pytest.raises(S3Error):
+        await signed_client.get_json("a.json")
+    assert len(endpoint.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_signed_client_sends_session_token(monkeypatch, endpoint):
+    """Test that temporary credentials include the security token header."""
+    monkeypatch.setattr(settings, "AWS_SESSION_TOKEN", "session-token")
+    signed = _SignedS3Client(transport=httpx.MockTransport(endpoint))
+
+    with pytest.raises(ClientError):
+        await signed.head_object(Bucket="bucket", Key="missing.json")
+
+    assert endpoint.requests[0].headers["x-amz-security-token"] == "session-token"
+    await signed.close()
+
+
+@pytest.mark.asyncio
+async def test_list_keys_pages_through_prefix(client, fake_s3):
+    """Test that every page under the prefix is collected."""
+    for name in ("a", "b", "c", "d", "e"):
+        fake_s3.objects[f"jobs/{name}.json"] = {"Body": b"{}", "ETag": '"e1"'}
+    fake_s3.objects["other/x.json"] = {"Body": b"{}", "ETag": '"e1"'}
+
+    assert await client.list_keys("jobs/") == [f"jobs/{name}.json" for name in "abcde"]
+
+
+@pytest.mark.asyncio
+async def test_list_keys_chains_underlying_error(client, fake_s3):
+    """Test that a listing failure surfaces the S3 error, not the TaskGroup wrapper."""
+    fake_s3.list_error = "AccessDenied"
+
+    with pytest.raises(S3Error) as exc_info:
+        await client.list_keys("jobs/")
+
+    assert isinstance(exc_info.value.__cause__, ClientError)
+    assert "AccessDenied" in str(exc_info.value.__cause__)
+
+
+@pytest.mark.asyncio
+async def test_get_json_fields_remembers_select_unavailable(client, fake_s3):
+    """Test that Select is not retried once the bucket reports it unsupported."""
+    fake_s3.objects["a.json"] = {"Body": b'{"a": 1, "b": 2}', "ETag": '"e1"'}
+
+    assert await client.get_json_fields("a.json", ["a"]) == {"a": 1}
+    assert await client.get_json_fields("a.json", ["b"]) == {"b": 2}
+
+    assert fake_s3.count("select_object_content") == 1
+    assert client._select_unavailable
+
+
+@pytest.mark.asyncio
+async def test_get_json_fields_selects_from_gzipped_objects(client, fake_s3):
+    """Test that Select is told to inflate objects put_json stored gzipped."""
+    fake_s3.select_error = None
+    data = {"aiSummary": "summary", "votes": [{"id": i, "vote": "yes"} for i in range(100)]}
+    await client.put_json("votes/ca-12/2024.json", data)
+    await client.put_json("metadata/ca-12.json", {"hash": "h1"})
+
+    assert fake_s3.objects["votes/ca-12/2024.json"]["ContentEncoding"] == "gzip"
+    assert await client.get_json_fields("votes/ca-12/2024.json", ["aiSummary"]) == {
+        "aiSummary": "summary"
+    }
+    assert await client.get_json_fields("metadata/ca-12.json", ["hash"]) == {"hash": "h1"}
+    assert await client.get_json_fields("missing.json", ["hash"]) is None
+
+    assert fake_s3.count("select_object_content") == 2
+    assert fake_s3.count("get_object") == 0
+
+
+@pytest.mark.asyncio
+async def test_get_json_fields_raises_on_other_select_errors(client, fake_s3):
+    """Test that throttling or access errors from Select are not masked by a full read."""
+    fake_s3.objects["a.json"] = {"Body": b'{"a": 1}', "ETag": '"e1"'}
+    fake_s3.select_error = "SlowDown"
+
+    with pytest.raises(S3Error):
+        await client.get_json_fields("a.json", ["a"])
+
+    assert fake_s3.count("get_object") == 0
+    assert not client._select_unavailable
+
+
+@pytest.mark.asyncio
+async def test_metadata_round_trip_normalizes_last_updated(client, fake_s3):
+    """Test that saved metadata reads back as a model with a UTC lastUpdated."""
+    fake_s3.objects["metadata/ca-11.json"] = {
+        "Body": b'{"hash": "h0", "lastUpdated": "2024-01-01T00:00:00"}',
+        "ETag": '"e0"',
+    }
+    await client.save_metadata("ca-12", MetadataRecord(hash="h1", votesHash="v1"))
+
+    legacy = await client.get_metadata("ca-11")
+    record = await client.get_metadata("ca-12")
+
+    assert record.hash == "h1"
+    assert record.votesHash == "v1"
+    assert legacy.lastUpdated.tzinfo == timezone.utc
+    assert record.lastUpdated.tzinfo == timezone.utc
+    assert record.lastUpdated > legacy.lastUpdated
+
+
+@pytest.mark.asyncio
+async def test_exists_uses_preloaded_prefix_until_expiry(client, fake_s3):
+    """Test that exists() answers from the preloaded key set until its TTL lapses."""
+    fake_s3.objects["metadata/ca-12.json"] = {"Body": b"{}", "ETag": '"e1"'}
+    await client.ensure_prefix_loaded("metadata/", ttl=60)
+
+    assert await client.exists("metadata/ca-12.json", prefix_hint="metadata/")
+    assert not await client.exists("metadata/tx-sen.json", prefix_hint="metadata/")
+    assert fake_s3.count("head_object") == 0
+
+    keys, _ = client._exists_cache["metadata/"]
+    client._exists_cache["metadata/"] = (keys, 0)
+
+    assert not await client.exists("metadata/tx-sen.json", prefix_hint="metadata/")
+    assert fake_s3.count("head_object") == 1
+
+
+@pytest.mark.asyncio
+async def test_list_keys_sharded_covers_urlsafe_keys(client, fake_s3):
+    """Test that keys starting with uppercase, '-' or '_' are not dropped."""
+    names = ["ca-12", "Z9", "-token", "_token", "0abc"]
+    for name in names:
+        fake_s3.objects[f"p/{name}"] = {"Body": b"{}", "ETag": '"e1"'}
+
+    keys = await client.list_keys_sharded("p/")
+
+    assert sorted(keys) == sorted(f"p/{name}" for name in names)
+    assert sorted(keys) == sorted(await client.list_keys("p/"))
+
+
+@pytest.mark.asyncio
+async def test_large_bodies_stream_into_presized_buffer(monkeypatch, client, fake_s3):
+    """Test that bodies above the streaming threshold are read chunk by chunk."""
+    data = {"votes": ["x" * 100] * 20_000}
+    body = orjson.dumps(data)
+    assert len(body) > client._stream_read_threshold
+    fake_s3.objects["big.json"] = {"Body": body, "ETag": '"e1"'}
+
+    async def unexpected_read(self):
+        raise AssertionError("large bodies must be streamed")
+
+    monkeypatch.setattr(FakeBody, "read", unexpected_read)
+
+    assert await client.get_json("big.json") == data
+
+
+@pytest.mark.asyncio
+async def test_large_body_short_read_is_truncated(client, fake_s3):
+    """Test that a stream ending before ContentLength returns only the bytes read."""
+    body = orjson.dumps({"votes": ["x" * 100] * 20_000})
+    fake_s3.objects["big.json"] = {
+        "Body": body,
+        "ETag": '"e1"',
+        "ContentLength": len(body) + 4096,
+    }
+
+    content = await client._get_bytes("big.json")
+
+    assert content == body
+    assert len(content) == len(body)
+
+
+@pytest.mark.asyncio
+async def test_put_json_gzips_large_bodies(client, fake_s3):
+    """Test that large bodies are stored gzipped and read back transparently."""
+    data = {"votes": [{"id": i, "vote": "yes"} for i in range(100)]}
+
+    await client.put_json("votes/ca-12/2024.json", data)
+
+    stored = fake_s3.objects["votes/ca-12/2024.json"]
+    assert stored["ContentEncoding"] == "gzip"
+    assert orjson.loads(gzip.decompress(stored["Body"])) == data
+    assert await client.get_json("votes/ca-12/2024.json") == data
+
+
+@pytest.mark.asyncio
+async def test_put_json_gzip_output_is_deterministic(monkeypatch, client, fake_s3):
+    """Test that rewriting identical data yields identical bytes and ETag."""
+    data = {"votes": [{"id": i, "vote": "yes"} for i in range(100)]}
+
+    await client.put_json("a.json", data)
+    first = fake_s3.objects["a.json"]["ETag"]
+    monkeypatch.setattr(gzip.time, "time", lambda: 2_000_000_000.0)
+    await client.put_json("a.json", data)
+
+    assert fake_s3.objects["a.json"]["ETag"] == first
+
+
+@pytest.mark.asyncio
+async def test_get_json_reads_legacy_uncompressed_objects(client, fake_s3):
+    """Test that objects written before compression are still readable."""
+    fake_s3.objects["officials/ca/district_12.json"] = {
+        "Body": b'{\n  "id": "ca-12"\n}',
+        "ETag": '"e1"',
+    }
+
+    assert await client.get_json("officials/ca/district_12.json") == {"id": "ca-12"}
+
+
+@pytest.mark.asyncio
+async def test_put_json_skip_unchanged(client, fake_s3):
+    """Test that skip_unchanged skips identical content and writes changed content."""
+    await client.put_json("a.json", {"b": 1, "a": 2}, skip_unchanged=True)
+    await client.put_json("a.json", {"a": 2, "b": 1}, skip_unchanged=True)
+
+    assert fake_s3.count("put_object") == 1
+
+    await client.put_json("a.json", {"a": 3, "b": 1}, skip_unchanged=True)
+
+    assert fake_s3.count("put_object") == 2
+    assert await client.get_json("a.json") == {"a": 3, "b": 1}
+
+
+@pytest.mark.asyncio
+async def test_save_metadata_skips_when_only_last_updated_differs(monkeypatch, client, fake_s3):
+    """Test that re-saving unchanged metadata later in time does not rewrite it."""
+    monkeypatch.setattr(s3_client_module, "_now_iso", lambda: "2024-01-01T00:00:00+00:00")
+    await client.save_metadata("ca-12", MetadataRecord(hash="h1"))
+
+    monkeypatch.setattr(s3_client_module, "_now_iso", lambda: "2024-06-01T00:00:00+00:00")
+    await client.save_metadata(
+        "ca-12", MetadataRecord(hash="h1", lastUpdated="2024-01-01T00:00:00Z")
+    )
+
+    assert fake_s3.count("put_object") == 1
+
+    await client.save_metadata("ca-12", MetadataRecord(hash="h2"))
+
+    assert fake_s3.count("put_object") == 2
+    record = await client.get_metadata("ca-12")
+    assert record.hash == "h2"
+    assert record.lastUpdated.month == 6
+
+
+@pytest.mark.asyncio
+async def test_delete_many_reports_partial_failure(client, fake_s3):
+    """Test that failed keys are reported and keep their cache entries."""
+    keys = [f"jobs/job-{i:04d}.json" for i in range(1500)]
+    for key in keys:
+        fake_s3.objects[key] = {"Body": b"{}", "ETag": '"e1"'}
+    await client.ensure_prefix_loaded("jobs/")
+    await client.get_json(keys[0])
+    await client.get_json(keys[1200])
+    fake_s3.undeletable = {keys[1200]}
+
+    assert await client.delete_many(keys) is False
+
+    assert [size for op, size in fake_s3.calls if op == "delete_objects"] == [1000, 500]
+    assert list(fake_s3.objects) == [keys[1200]]
+    assert keys[0] not in client._etag_cache
+    assert keys[1200] in client._etag_cache
+    assert await client.exists(keys[1200], prefix_hint="jobs/")
+    assert not await client.exists(keys[0], prefix_hint="jobs/")
+    assert fake_s3.count("head_object") == 0
+
+
+@pytest.mark.asyncio
+async def test_delete_many_returns_true_when_all_deleted(client, fake_s3):
+    """Test that a fully successful batch delete reports success."""
+    fake_s3.objects["a.json"] = {"Body": b"{}", "ETag": '"e1"'}
+
+    assert await client.delete_many(["a.json"]) is True
+    assert fake_s3.objects == {}